@@ -0,0 +1,4 @@
+"""IPL squad selection: player statistics, ratings, backtests and the cricket-squad CLI.
+
+Kept free of imports so the CLI starts without loading pandas.
+"""
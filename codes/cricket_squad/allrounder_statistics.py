@@ -1,6 +1,7 @@
 import pandas as pd
 from collections import defaultdict
 import numpy as np
+import sys
 
 class CricketAllRounderAnalyzer:
     def __init__(self):
@@ -290,30 +291,47 @@ class CricketAllRounderAnalyzer:
         self._calculate_results()
         return self.generate_stats()
 
+ALLROUNDER_COLUMNS = [
+    'Player', 'Team', 'X(RAB)', 'x(Bowl)', 'x(SR)', 'x(4)', 'x(6)', 'x(OP)', 'x(VNU)', 'x(W/L)',
+    'T(50)', 'T(100)', 'T.RAB', 'TBF', 'Avg.Run', 'Avg.SR', 'RF(50s)', 'RF(100s)',
+    'L', 'W', 'D', 'x(Over)', 'x(Run)', 'X(Wic)', 'x(Mdn)', 'x(ECN)', 'T(4s)',
+    'T(6s)', 'T.over', 'T.Run.Given', 'T.Wic', 'T.Mdn', 'T.ECN', 'T.Win', 'T.Loss',
+    'Avg.RAB', 'Avg.BF', 'Avg.SR', 'Avg.over', 'Avg.Run.Given', 'Avg.Wic', 'Avg.Mdn',
+    'Avg.ECN', 'Avg.Win', 'Avg.loss', 'Win(in percent)', 'Loss(in percent)'
+]
+
+
+def process_allrounder_data(input_file, output_file):
+    """Process all-rounder data from input CSV file and save results to output CSV"""
+    try:
+        print(f"Reading input file: {input_file}")
+        df = pd.read_csv(input_file)
+
+        print("Processing data...")
+        analyzer = CricketAllRounderAnalyzer()
+        result_df = analyzer.process_data(df)
+
+        # Add missing columns with default values
+        for col in ALLROUNDER_COLUMNS:
+            if col not in result_df.columns:
+                result_df[col] = np.nan
+
+        # Order columns properly
+        result_df = result_df[ALLROUNDER_COLUMNS]
+
+        # Save with player details
+        result_df.to_csv(output_file, index=False)
+        print(f"\nSuccessfully processed data and saved to {output_file}")
+        print(result_df[['Player', 'Team', 'X(RAB)', 'T.Wic', 'Win(in percent)']].head())
+        return True
+
+    except Exception as e:
+        print(f"Error processing data: {str(e)}", file=sys.stderr)
+        return False
+
 # Usage
 if __name__ == "__main__":
-    analyzer = CricketAllRounderAnalyzer()
-    df = pd.read_csv("../deliveries.csv")
-    result_df = analyzer.process_data(df)
-    
-    # Ensure all columns exist
-    required_columns = [
-        'Player', 'Team', 'X(RAB)', 'x(Bowl)', 'x(SR)', 'x(4)', 'x(6)', 'x(OP)', 'x(VNU)', 'x(W/L)',
-        'T(50)', 'T(100)', 'T.RAB', 'TBF', 'Avg.Run', 'Avg.SR', 'RF(50s)', 'RF(100s)',
-        'L', 'W', 'D', 'x(Over)', 'x(Run)', 'X(Wic)', 'x(Mdn)', 'x(ECN)', 'T(4s)',
-        'T(6s)', 'T.over', 'T.Run.Given', 'T.Wic', 'T.Mdn', 'T.ECN', 'T.Win', 'T.Loss',
-        'Avg.RAB', 'Avg.BF', 'Avg.SR', 'Avg.over', 'Avg.Run.Given', 'Avg.Wic', 'Avg.Mdn',
-        'Avg.ECN', 'Avg.Win', 'Avg.loss', 'Win(in percent)', 'Loss(in percent)'
-    ]
-    
-    # Add missing columns with default values
-    for col in required_columns:
-        if col not in result_df.columns:
-            result_df[col] = np.nan
-            
-    # Order columns properly
-    result_df = result_df[required_columns]
-    
-    # Save with player details
-    result_df.to_csv("allrounder_performance.csv", index=False)
-    print(result_df[['Player', 'Team', 'X(RAB)', 'T.Wic', 'Win(in percent)']].head())
\ No newline at end of file
+    # Run as `python -m cricket_squad.allrounder_statistics` from codes/; the relative
+    # imports fail when the file is run directly. Options match `cricket-squad allrounder`
+    from .cli import main
+    sys.exit(main(['allrounder'] + sys.argv[1:]))
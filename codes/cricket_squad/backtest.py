@@ -0,0 +1,397 @@
+import os
+import sys
+import json
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .script import CricketDataProcessor
+from .script_bowlers import BowlerDataProcessor, BOWLER_DISMISSALS
+from .ratings import min_max, balanced_xi, bowler_consistency
+
+FORM_WINDOW = 5
+WICKET_POINTS = 20
+# Franchise renames, mapped to the current name so a team keeps its history
+TEAM_RENAMES = {
+    'Delhi Daredevils': 'Delhi Capitals',
+    'Kings XI Punjab': 'Punjab Kings',
+    'Royal Challengers Bangalore': 'Royal Challengers Bengaluru',
+    'Rising Pune Supergiants': 'Rising Pune Supergiant',
+}
+
+
+def _delivery_row(match_id, inning, batting_team, bowling_team, over, ball, delivery):
+    """Flatten a Cricsheet delivery into the deliveries.csv row layout used by the processors"""
+    extras = delivery.get('extras', {})
+    extras_type = None
+    for kind in ('wides', 'noballs', 'legbyes', 'byes', 'penalty'):
+        if kind in extras:
+            extras_type = kind
+            break
+
+    wickets = delivery.get('wickets', [])
+    wicket = wickets[0] if wickets else {}
+
+    return {
+        'match_id': match_id,
+        'inning': inning,
+        'batting_team': batting_team,
+        'bowling_team': bowling_team,
+        'over': over,
+        'ball': ball,
+        'batter': delivery['batter'],
+        'bowler': delivery['bowler'],
+        'non_striker': delivery['non_striker'],
+        'batsman_runs': delivery['runs']['batter'],
+        'extra_runs': delivery['runs']['extras'],
+        'total_runs': delivery['runs']['total'],
+        'extras_type': extras_type,
+        'is_wicket': 1 if wickets else 0,
+        'player_dismissed': wicket.get('player_out'),
+        'dismissal_kind': wicket.get('kind'),
+    }
+
+
+def load_match(path):
+    """Read one Cricsheet JSON file into match context plus flattened deliveries"""
+    with open(path) as f:
+        data = json.load(f)
+
+    info = data['info']
+    match_id = int(os.path.splitext(os.path.basename(path))[0])
+    teams = [TEAM_RENAMES.get(team, team) for team in info['teams']]
+    winner = info['outcome'].get('winner')
+
+    rows = []
+    substitutes = defaultdict(set)
+    inning = 0
+    for innings in data['innings']:
+        for over in innings['overs']:
+            for delivery in over['deliveries']:
+                for replacement in delivery.get('replacements', {}).get('match', []):
+                    team = TEAM_RENAMES.get(replacement['team'], replacement['team'])
+                    substitutes[team].add(replacement['in'])
+
+        # Super overs decide ties but are not part of a player's T20 record
+        if innings.get('super_over'):
+            continue
+        inning += 1
+        batting_team = TEAM_RENAMES.get(innings['team'], innings['team'])
+        bowling_team = teams[1] if batting_team == teams[0] else teams[0]
+        for over in innings['overs']:
+            for ball, delivery in enumerate(over['deliveries'], start=1):
+                rows.append(_delivery_row(match_id, inning, batting_team, bowling_team,
+                                          over['over'], ball, delivery))
+
+    # From 2023 the player list also names the impact player and any concussion
+    # substitute; the starting XI is everyone who was not brought on
+    players = {TEAM_RENAMES.get(team, team): team_players for team, team_players in info['players'].items()}
+    starting_xi = {team: [p for p in team_players if p not in substitutes[team]]
+                   for team, team_players in players.items()}
+
+    return {
+        'match_id': match_id,
+        'date': info['dates'][0],
+        'season': str(info['season']),
+        'teams': teams,
+        'players': players,
+        'starting_xi': starting_xi,
+        'winner': TEAM_RENAMES.get(winner, winner),
+        'rows': rows,
+    }
+
+
+def load_matches(json_dir, workers=None):
+    """Parse every match in json_dir in parallel and return them in date order"""
+    paths = [os.path.join(json_dir, name) for name in os.listdir(json_dir)
+             if name.endswith('.json')]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        matches = list(pool.map(load_match, paths, chunksize=32))
+    matches.sort(key=lambda m: (m['date'], m['match_id']))
+    return matches
+
+
+def match_performances(rows):
+    """Per-player runs, balls, wickets and runs conceded for a single match"""
+    perf = defaultdict(lambda: {'runs': 0, 'balls': 0, 'outs': 0, 'wickets': 0,
+                                'balls_bowled': 0, 'runs_given': 0, 'maidens': 0})
+    overs = defaultdict(lambda: {'runs': 0, 'balls': 0})
+    for row in rows:
+        extras_type = row['extras_type']
+        batter = perf[row['batter']]
+        bowler = perf[row['bowler']]
+
+        if extras_type in (None, 'noballs'):
+            batter['runs'] += row['batsman_runs']
+            batter['balls'] += 1
+
+        if extras_type != 'wides':
+            bowler['balls_bowled'] += 1
+        bowler['runs_given'] += row['batsman_runs']
+        if extras_type in ('wides', 'noballs'):
+            bowler['runs_given'] += row['extra_runs']
+
+        if row['is_wicket'] == 1:
+            if row['player_dismissed']:
+                perf[row['player_dismissed']]['outs'] += 1
+            if row['dismissal_kind'] in BOWLER_DISMISSALS:
+                bowler['wickets'] += 1
+
+        # Same maiden rule as BowlerDataProcessor: a full over with no runs off the bowler
+        over = overs[(row['inning'], row['over'], row['bowler'])]
+        over['runs'] += row['batsman_runs'] + (row['extra_runs'] if extras_type in ('wides', 'noballs') else 0)
+        if extras_type != 'wides':
+            over['balls'] += 1
+
+    for (_, _, bowler), over in overs.items():
+        if over['balls'] >= 6 and over['runs'] == 0:
+            perf[bowler]['maidens'] += 1
+    return perf
+
+
+def match_points(perf):
+    """Simple impact score used to judge a pick against what actually happened"""
+    return perf['runs'] + WICKET_POINTS * perf['wickets']
+
+
+class BacktestEngine:
+    """Replays matches in date order, picking XIs from aggregates known before each match.
+
+    The batting and bowling processors are fed each match once after every
+    strategy has picked, so all strategies share the same incremental state.
+
+    The pool a team picks from is built only from matches already played:
+    everyone who has turned out for the team so far this season plus
+    everyone who played for it the season before. No squad lists are
+    available, so unused squad members never enter the pool, and last
+    season's players stay in it even if they have since moved on. A team's
+    first match in the data therefore has an empty pool.
+
+    Picks are scored against the starting XI. Impact players and concussion
+    substitutes (listed alongside the XI from 2023) are left out of the XI,
+    its points total and the previous-XI baseline, but they still join the
+    pools and form windows because they played.
+    """
+
+    def __init__(self, strategies=None):
+        self.batting = CricketDataProcessor()
+        self.bowling = BowlerDataProcessor()
+        self.recent = defaultdict(lambda: deque(maxlen=FORM_WINDOW))
+        # Counted per match here rather than re-scanning the processors' over logs
+        self.bowling_extras = defaultdict(lambda: {'maidens': 0, 'four_w': 0, 'five_w': 0})
+        self.last_xi = {}
+        self.season = None
+        self.season_players = defaultdict(set)
+        self.previous_season_players = defaultdict(set)
+        self.strategies = strategies or dict(STRATEGIES)
+        self.results = []
+
+    def _update(self, match, perf):
+        """Fold a completed match into the running aggregates"""
+        for row in match['rows']:
+            self.batting.process_ball(row)
+            self.bowling.process_ball(row)
+        # Close the last innings so not-out milestones are visible to the next pick
+        self.batting._finalize_innings()
+        self.batting.current_innings = None
+
+        for team, xi in match['starting_xi'].items():
+            self.last_xi[team] = set(xi)
+        for team, players in match['players'].items():
+            self.season_players[team].update(players)
+            for player in players:
+                self.recent[player].append(dict(perf[player]))
+                extras = self.bowling_extras[player]
+                extras['maidens'] += perf[player]['maidens']
+                if perf[player]['wickets'] == 4:
+                    extras['four_w'] += 1
+                elif perf[player]['wickets'] >= 5:
+                    extras['five_w'] += 1
+
+    def _start_season(self, season):
+        """Roll the season's players over so they seed next season's pools"""
+        for team, players in self.season_players.items():
+            self.previous_season_players[team] = players
+        self.season_players = defaultdict(set)
+        self.season = season
+
+    def pool(self, team):
+        """Players a team could pick from using only matches already played"""
+        return self.season_players[team] | self.previous_season_players[team]
+
+    def run_match(self, match):
+        if match['season'] != self.season:
+            self._start_season(match['season'])
+        perf = match_performances(match['rows'])
+
+        for team in match['teams']:
+            actual = set(match['starting_xi'][team])
+            pool = self.pool(team)
+            possible = sum(match_points(perf[p]) for p in actual)
+
+            for name, strategy in self.strategies.items():
+                picked = strategy(self, team, pool)
+                captured = sum(match_points(perf[p]) for p in picked & actual)
+                self.results.append({
+                    'Strategy': name,
+                    'Season': match['season'],
+                    'Date': match['date'],
+                    'MatchId': match['match_id'],
+                    'Team': team,
+                    'Won': match['winner'] == team,
+                    'Decided': match['winner'] is not None,
+                    'Overlap': len(picked & actual),
+                    'PointsCaptured': captured,
+                    'PointsShare': round(captured / possible, 4) if possible else 0,
+                })
+
+        self._update(match, perf)
+
+    def run(self, matches):
+        for match in matches:
+            self.run_match(match)
+        return pd.DataFrame(self.results)
+
+
+def career_strategy(engine, team, pool):
+    """Career batting average and bowling strike rate"""
+    bat_scores, bowl_scores = {}, {}
+    for player in pool:
+        bat = engine.batting.player_stats.get(player)
+        if bat and bat['balls_faced']:
+            bat_scores[player] = bat['runs'] / max(1, bat['dismissals'])
+        bowl = engine.bowling.bowler_stats.get(player)
+        if bowl and bowl['balls_bowled']:
+            bowl_scores[player] = bowl['wickets'] / bowl['balls_bowled']
+    return balanced_xi(pool, bat_scores, bowl_scores)
+
+
+def consistency_strategy(engine, team, pool):
+    """Consistency scores from the Consistency notebooks.
+
+    Batting uses the 0.4/0.3/0.1 weights of BattingScore.ipynb on min-max
+    scaled Ave, 50+ per innings and non-boundary strike rate. Bowling uses
+    the final weighted formula of BowlerConsistency.ipynb on career totals,
+    scaled across the squad afterwards. Bowlers without a wicket have no
+    Ave or SR and are left unscored, as the notebook drops them.
+    """
+    ave, fifty_plus, nb_sr = {}, {}, {}
+    bowl_scores = {}
+    for player in pool:
+        bat = engine.batting.player_stats.get(player)
+        if bat and bat['innings']:
+            innings = len(bat['innings'])
+            boundary_balls = bat['fours'] + bat['sixes']
+            boundary_runs = 4 * bat['fours'] + 6 * bat['sixes']
+            ave[player] = bat['runs'] / max(1, bat['dismissals'])
+            fifty_plus[player] = (bat['fifties'] + bat['hundreds']) / innings
+            non_boundary_balls = bat['balls_faced'] - boundary_balls
+            nb_sr[player] = ((bat['runs'] - boundary_runs) / non_boundary_balls * 100
+                             if non_boundary_balls > 0 else 0)
+        bowl = engine.bowling.bowler_stats.get(player)
+        if bowl and bowl['wickets']:
+            extras = engine.bowling_extras[player]
+            wickets = bowl['wickets']
+            bowl_scores[player] = bowler_consistency(
+                len(bowl['innings']) / len(bowl['matches']), wickets,
+                bowl['runs_given'] / wickets, bowl['runs_given'] / (bowl['balls_bowled'] / 6),
+                bowl['balls_bowled'] / wickets, extras['four_w'], extras['five_w'], extras['maidens'])
+
+    ave, fifty_plus, nb_sr = min_max(ave), min_max(fifty_plus), min_max(nb_sr)
+    bat_scores = {p: 0.4 * ave[p] + 0.3 * fifty_plus[p] + 0.1 * nb_sr[p] for p in ave}
+    return balanced_xi(pool, bat_scores, min_max(bowl_scores))
+
+
+def form_strategy(engine, team, pool):
+    """Form over each player's last few matches.
+
+    Batting uses the BattingScore.ipynb Form weights (0.6 Ave + 0.4 SR, with
+    Ave as runs per dismissal). Bowling is a simplified stand-in, 0.6 wickets
+    per match + 0.4 inverted economy, not the Bowlerform.ipynb formula.
+    """
+    ave, sr = {}, {}
+    wkts, econ = {}, {}
+    for player in pool:
+        recent = engine.recent.get(player)
+        if not recent:
+            continue
+        runs = sum(m['runs'] for m in recent)
+        balls = sum(m['balls'] for m in recent)
+        outs = sum(m['outs'] for m in recent)
+        balls_bowled = sum(m['balls_bowled'] for m in recent)
+        if balls:
+            ave[player] = runs / outs if outs else runs
+            sr[player] = runs / balls * 100
+        if balls_bowled:
+            wkts[player] = sum(m['wickets'] for m in recent) / len(recent)
+            econ[player] = sum(m['runs_given'] for m in recent) / (balls_bowled / 6)
+
+    ave, sr = min_max(ave), min_max(sr)
+    wkts, econ = min_max(wkts), min_max(econ)
+    bat_scores = {p: 0.6 * ave[p] + 0.4 * sr[p] for p in ave}
+    bowl_scores = {p: 0.6 * wkts[p] + 0.4 * (1 - econ[p]) for p in wkts}
+    return balanced_xi(pool, bat_scores, bowl_scores)
+
+
+def previous_xi_strategy(engine, team, pool):
+    """Baseline: name the team's previous XI unchanged"""
+    return engine.last_xi.get(team, set()) & pool
+
+
+STRATEGIES = {
+    'previous_xi': previous_xi_strategy,
+    'career': career_strategy,
+    'consistency': consistency_strategy,
+    'form': form_strategy,
+}
+
+
+def summarize_backtest(results):
+    """Per-strategy agreement with the real XI, split by whether that XI won"""
+    decided = results[results['Decided']]
+    summary = decided.groupby('Strategy').agg(
+        Picks=('Overlap', 'size'),
+        AvgOverlap=('Overlap', 'mean'),
+        AvgPointsShare=('PointsShare', 'mean'),
+    )
+    summary['OverlapWhenWon'] = decided[decided['Won']].groupby('Strategy')['Overlap'].mean()
+    summary['OverlapWhenLost'] = decided[~decided['Won']].groupby('Strategy')['Overlap'].mean()
+    return summary.round(3).sort_values('AvgPointsShare', ascending=False)
+
+
+def process_backtest(json_dir, output_file, workers=None):
+    """Backtest every strategy over the Cricsheet matches in json_dir and save per-pick results"""
+    try:
+        print(f"Reading matches from: {json_dir}")
+        matches = load_matches(json_dir, workers)
+        if not matches:
+            print(f"No matches found in {json_dir}", file=sys.stderr)
+            return False
+        print(f"Replaying {len(matches)} matches "
+              f"({matches[0]['date']} to {matches[-1]['date']})...")
+
+        engine = BacktestEngine()
+        results = engine.run(matches)
+
+        if len(results):
+            results.to_csv(output_file, index=False)
+            print(f"\nSuccessfully backtested {len(engine.strategies)} strategies and saved to {output_file}")
+
+            print("\nStrategy summary:")
+            print(summarize_backtest(results))
+            return True
+        else:
+            print("No matches were backtested")
+            return False
+
+    except Exception as e:
+        print(f"Error running backtest: {str(e)}", file=sys.stderr)
+        return False
+
+
+if __name__ == "__main__":
+    # Run as `python -m cricket_squad.backtest` from codes/; the relative
+    # imports fail when the file is run directly. Options match `cricket-squad backtest`
+    from .cli import main
+    sys.exit(main(['backtest'] + sys.argv[1:]))
@@ -0,0 +1,157 @@
+import argparse
+import csv
+import sys
+
+# Only the standard library is imported at module level. pandas, numpy and the
+# processors are imported inside the commands that need them, so `--help`,
+# `ratings` and `select` start without paying for the analysis stack.
+# Every handler returns True on success so main can turn it into an exit status.
+
+
+def _batting(args):
+    from .script import process_cricket_data
+    return process_cricket_data(args.input, args.output)
+
+
+def _bowling(args):
+    from .script_bowlers import process_bowler_data
+    return process_bowler_data(args.input, args.output)
+
+
+def _allrounder(args):
+    from .allrounder_statistics import process_allrounder_data
+    return process_allrounder_data(args.input, args.output)
+
+
+def _phases(args):
+    from .phase_metrics import process_phase_data
+    return process_phase_data(args.input, args.batting_output, args.bowling_output)
+
+
+def _backtest(args):
+    from .backtest import process_backtest
+    return process_backtest(args.json_dir, args.output, args.workers)
+
+
+def _ratings(args):
+    from .ratings import read_rows, batting_ratings, bowling_ratings, combine_ratings
+
+    batting = batting_ratings(read_rows(args.batting), args.min_balls, args.min_dismissals) if args.batting else {}
+    bowling = bowling_ratings(read_rows(args.bowling), args.min_balls) if args.bowling else {}
+    rows = combine_ratings(batting, bowling)
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ['Player'])
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Saved ratings for {len(rows)} players to {args.output}")
+
+    for row in rows[:args.top]:
+        print(f"{row['Player']:<24} bat {row['BattingRating']:.3f} (pct {row['BattingPercentile']:.2f})  "
+              f"bowl {row['BowlingRating']:.3f} (pct {row['BowlingPercentile']:.2f})")
+    return True
+
+
+def _read_squad(args):
+    if args.squad_file:
+        with open(args.squad_file) as f:
+            return {line.strip() for line in f if line.strip()}
+    if args.squad:
+        return {name.strip() for name in args.squad.split(',') if name.strip()}
+    return None
+
+
+def _select(args):
+    from .ratings import read_rows, balanced_xi
+
+    rows = read_rows(args.ratings)
+    bat_scores = {r['Player']: float(r['BattingRating']) for r in rows}
+    bowl_scores = {r['Player']: float(r['BowlingRating']) for r in rows}
+
+    squad = _read_squad(args)
+    pool = squad if squad is not None else set(bat_scores)
+    unrated = sorted(pool - set(bat_scores))
+    if unrated:
+        print(f"No ratings for: {', '.join(unrated)}", file=sys.stderr)
+        pool = pool - set(unrated)
+
+    xi = sorted(balanced_xi(pool, bat_scores, bowl_scores),
+                key=lambda p: (-bat_scores.get(p, 0), p))
+    for player in xi:
+        print(f"{player:<24} bat {bat_scores.get(player, 0):.3f}  bowl {bowl_scores.get(player, 0):.3f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write('\n'.join(xi) + '\n')
+    return True
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='cricket-squad',
+        description='IPL squad selection: player statistics, ratings and XI selection.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    for name, handler, output, help_text in (
+            ('batting', _batting, 'cricket_statistics_fixed.csv', 'Batting statistics from ball-by-ball data'),
+            ('bowling', _bowling, 'bowler_statistics.csv', 'Bowling statistics from ball-by-ball data'),
+            ('allrounder', _allrounder, 'allrounder_performance.csv', 'All-rounder statistics from ball-by-ball data')):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('-i', '--input', default='deliveries.csv', help='deliveries CSV (default: %(default)s)')
+        command.add_argument('-o', '--output', default=output, help='output CSV (default: %(default)s)')
+        command.set_defaults(handler=handler)
+
+    command = commands.add_parser('phases', help='Powerplay/middle/death and chase-pressure splits')
+    command.add_argument('-i', '--input', default='deliveries.csv', help='deliveries CSV (default: %(default)s)')
+    command.add_argument('--batting-output', default='batting_phase_statistics.csv',
+                         help='batting splits CSV (default: %(default)s)')
+    command.add_argument('--bowling-output', default='bowling_phase_statistics.csv',
+                         help='bowling splits CSV (default: %(default)s)')
+    command.set_defaults(handler=_phases)
+
+    command = commands.add_parser('backtest', help='Replay past seasons to score selection strategies')
+    command.add_argument('--json-dir', default='ipl_json', help='Cricsheet JSON directory (default: %(default)s)')
+    command.add_argument('-o', '--output', default='backtest_results.csv', help='per-pick results CSV (default: %(default)s)')
+    command.add_argument('-j', '--workers', type=int, default=None, help='parser processes (default: CPU count)')
+    command.set_defaults(handler=_backtest)
+
+    command = commands.add_parser('ratings', help='Player ratings from cached batting/bowling statistics')
+    command.add_argument('--batting', help='CSV written by the batting command')
+    command.add_argument('--bowling', help='CSV written by the bowling command')
+    command.add_argument('--min-balls', type=int, default=250,
+                         help='ignore players with fewer balls faced/bowled (default: %(default)s)')
+    command.add_argument('--min-dismissals', type=int, default=10,
+                         help='ignore batters dismissed fewer times (default: %(default)s)')
+    command.add_argument('-o', '--output', help='ratings CSV to write')
+    command.add_argument('--top', type=int, default=10, help='players to print (default: %(default)s)')
+    command.set_defaults(handler=_ratings)
+
+    command = commands.add_parser('select', help='Pick a balanced XI from a ratings CSV')
+    command.add_argument('--ratings', default='ratings.csv', help='CSV written by the ratings command (default: %(default)s)')
+    squad = command.add_mutually_exclusive_group()
+    squad.add_argument('--squad', help='comma-separated squad to pick from (default: every rated player)')
+    squad.add_argument('--squad-file', help='file with one squad member per line')
+    command.add_argument('-o', '--output', help='file to write the XI to, one player per line')
+    command.set_defaults(handler=_select)
+
+    return parser
+
+
+def main(argv=None):
+    """Run one command and return its exit status: 0 on success, 1 on failure"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'ratings' and not (args.batting or args.bowling):
+        parser.error('ratings needs --batting and/or --bowling')
+    try:
+        ok = args.handler(args)
+    except Exception as e:
+        # Matches the process_* commands, which catch and report their own errors
+        print(f"Error running {args.command}: {str(e)}", file=sys.stderr)
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+import pandas as pd
+from collections import defaultdict
+import numpy as np
+import sys
+
+from .script import CricketDataProcessor
+from .script_bowlers import BowlerDataProcessor, BOWLER_DISMISSALS
+
+PHASES = ('powerplay', 'middle', 'death')
+SUPER_OVER = 'super_over'
+POWERPLAY_OVERS = 6
+DEATH_OVER_START = 15
+INNINGS_BALLS = 120
+PRESSURE_RRR = 10.0
+PRESSURE_WICKETS_IN_HAND = 4
+# Tagging context that delivery_records folds into the situation key or drops
+DERIVED_ONLY_COLUMNS = {'target', 'required_run_rate', 'wickets_in_hand',
+                        'phase', 'chasing', 'under_pressure'}
+
+
+def tag_deliveries(df):
+    """Add phase, chase and pressure context to every delivery in one vectorized pass.
+
+    Expects the deliveries.csv layout sorted by match_id, inning, over and ball.
+    Targets come from the first-innings total, so rain-reduced chases are
+    treated as full 20-over chases. Super-over innings (inning 3 onwards) get
+    their own SUPER_OVER phase and are left out of every split.
+    """
+    df = df.copy()
+    extras_type = df['extras_type'].fillna('')
+    legal = (~extras_type.isin(['wides', 'noballs'])).astype(int)
+    innings = df.groupby(['match_id', 'inning'], sort=False)
+
+    df['phase'] = np.select(
+        [df['inning'] > 2, df['over'] < POWERPLAY_OVERS, df['over'] >= DEATH_OVER_START],
+        [SUPER_OVER, 'powerplay', 'death'], default='middle')
+
+    runs_before = innings['total_runs'].cumsum() - df['total_runs']
+    wickets_before = innings['is_wicket'].cumsum() - df['is_wicket']
+    legal_before = legal.groupby([df['match_id'], df['inning']], sort=False).cumsum() - legal
+
+    first_innings_total = df[df['inning'] == 1].groupby('match_id')['total_runs'].sum()
+    df['chasing'] = df['inning'] == 2
+    df['target'] = np.where(df['chasing'], df['match_id'].map(first_innings_total) + 1, np.nan)
+
+    balls_remaining = (INNINGS_BALLS - legal_before).clip(lower=1)
+    df['required_run_rate'] = (df['target'] - runs_before) / balls_remaining * 6
+    df['wickets_in_hand'] = 10 - wickets_before
+    df['under_pressure'] = df['chasing'] & (
+        (df['required_run_rate'] >= PRESSURE_RRR) |
+        (df['wickets_in_hand'] <= PRESSURE_WICKETS_IN_HAND))
+
+    # Per-ball figures the split processors would otherwise re-derive row by row
+    batsman_runs = df['batsman_runs'].fillna(0).astype(int)
+    extra_runs = df['extra_runs'].fillna(0).astype(int)
+    df['bat_runs'] = batsman_runs
+    df['faced'] = extras_type.isin(['', 'noballs'])
+    df['bowler_runs'] = batsman_runs + np.where(extras_type.isin(['wides', 'noballs']), extra_runs, 0)
+    df['bowler_ball'] = extras_type != 'wides'
+    # A no-ball is a ball faced but not a legal delivery, so batters and bowlers
+    # count dots over different balls
+    df['bat_dot'] = (batsman_runs == 0) & df['faced']
+    df['dot_ball'] = (batsman_runs == 0) & legal.astype(bool)
+    df['boundary'] = batsman_runs.isin([4, 6])
+    df['batter_out'] = (df['is_wicket'] == 1) & (df['player_dismissed'] == df['batter'])
+    df['bowler_wicket'] = (df['is_wicket'] == 1) & (
+        df['dismissal_kind'].astype(str).str.lower().isin(BOWLER_DISMISSALS))
+    return df
+
+
+def _split_counter():
+    return {'runs': 0, 'balls': 0, 'dots': 0, 'boundaries': 0, 'wickets': 0}
+
+
+def _add_ball(split, runs, ball, dot, boundary, wicket):
+    split['runs'] += runs
+    split['balls'] += ball
+    split['dots'] += dot
+    split['boundaries'] += boundary
+    split['wickets'] += wicket
+
+
+def _combine(splits, keep):
+    """Sum the (phase, chasing, under_pressure) counters whose key passes keep"""
+    total = _split_counter()
+    for key, split in splits.items():
+        if keep(*key):
+            for name, value in split.items():
+                total[name] += value
+    return total
+
+
+def _rate(numerator, denominator, scale=100):
+    return round(numerator / denominator * scale, 2) if denominator else 0
+
+
+def delivery_records(df):
+    """Plain dict rows for the processors, much cheaper to build and index than iterrows"""
+    columns = [c for c in df.columns if c not in DERIVED_ONLY_COLUMNS]
+    values = [df[c].tolist() for c in columns]
+    if 'phase' in df.columns:
+        # The (phase, chasing, under_pressure) key each ball is counted under,
+        # None for super overs
+        columns.append('situation')
+        values.append([None if key[0] == SUPER_OVER else key for key in
+                       zip(df['phase'], df['chasing'], df['under_pressure'])])
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+class PhaseBattingProcessor(CricketDataProcessor):
+    """Batting aggregates split by phase, chasing vs setting and chase pressure.
+
+    Rows must come from delivery_records over a tag_deliveries frame. Each
+    ball is counted once under its (phase, chasing, under_pressure) key and
+    the splits are summed out of those counters at the end.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.splits = defaultdict(lambda: defaultdict(_split_counter))
+
+    def process_ball(self, row):
+        super().process_ball(row)
+
+        batter = row['batter']
+        if pd.isna(batter) or batter == 'NA' or row['situation'] is None:
+            return
+
+        split = self.splits[batter][row['situation']]
+        if row['faced']:
+            _add_ball(split, row['bat_runs'], 1, row['bat_dot'], row['boundary'], row['batter_out'])
+        else:
+            # Wides and byes are not balls faced, but stumpings and run outs off
+            # them still count as dismissals, matching the base aggregation
+            split['wickets'] += row['batter_out']
+
+    def calculate_final_stats(self):
+        final_stats = super().calculate_final_stats()
+        for stats in final_stats:
+            splits = self.splits[stats['Player']]
+            for phase in PHASES:
+                split = _combine(splits, lambda p, chasing, pressure: p == phase)
+                name = phase.capitalize()
+                stats[f'{name}Runs'] = split['runs']
+                stats[f'{name}Balls'] = split['balls']
+                stats[f'{name}StrikeRate'] = _rate(split['runs'], split['balls'])
+                stats[f'{name}DotPercentage'] = _rate(split['dots'], split['balls'])
+                stats[f'{name}BoundaryPercentage'] = _rate(split['boundaries'], split['balls'])
+            for name, keep in (('Chasing', lambda p, chasing, pressure: chasing),
+                               ('Setting', lambda p, chasing, pressure: not chasing),
+                               ('Pressure', lambda p, chasing, pressure: pressure)):
+                split = _combine(splits, keep)
+                stats[f'{name}Runs'] = split['runs']
+                stats[f'{name}StrikeRate'] = _rate(split['runs'], split['balls'])
+                stats[f'{name}Average'] = _rate(split['runs'], split['wickets'] or 1, scale=1)
+        return final_stats
+
+
+class PhaseBowlerProcessor(BowlerDataProcessor):
+    """Bowling aggregates split by phase, defending vs bowling first and chase pressure.
+
+    Rows must come from delivery_records over a tag_deliveries frame.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.splits = defaultdict(lambda: defaultdict(_split_counter))
+
+    def process_ball(self, row):
+        super().process_ball(row)
+
+        bowler = row['bowler']
+        if pd.isna(bowler) or bowler == 'NA' or row['situation'] is None:
+            return
+
+        _add_ball(self.splits[bowler][row['situation']], row['bowler_runs'], row['bowler_ball'],
+                  row['dot_ball'], row['boundary'], row['bowler_wicket'])
+
+    def calculate_final_stats(self):
+        final_stats = super().calculate_final_stats()
+        for stats in final_stats:
+            splits = self.splits[stats['Bowler']]
+            for phase in PHASES:
+                split = _combine(splits, lambda p, chasing, pressure: p == phase)
+                name = phase.capitalize()
+                stats[f'{name}Balls'] = split['balls']
+                stats[f'{name}Wickets'] = split['wickets']
+                stats[f'{name}Economy'] = _rate(split['runs'], split['balls'], scale=6)
+                stats[f'{name}StrikeRate'] = _rate(split['balls'], split['wickets'], scale=1)
+                stats[f'{name}DotPercentage'] = _rate(split['dots'], split['balls'])
+                stats[f'{name}BoundaryPercentage'] = _rate(split['boundaries'], split['balls'])
+            # Defending a target means the batting side is chasing
+            for name, keep in (('BowlingFirst', lambda p, chasing, pressure: not chasing),
+                               ('Defending', lambda p, chasing, pressure: chasing),
+                               ('Pressure', lambda p, chasing, pressure: pressure)):
+                split = _combine(splits, keep)
+                stats[f'{name}Wickets'] = split['wickets']
+                stats[f'{name}Economy'] = _rate(split['runs'], split['balls'], scale=6)
+        return final_stats
+
+
+def process_phase_data(input_file, batting_output_file, bowling_output_file):
+    """Process deliveries into phase- and situation-split batting and bowling statistics"""
+    try:
+        # Read the CSV file using pandas
+        print(f"Reading input file: {input_file}")
+        df = pd.read_csv(input_file)
+
+        print("Tagging deliveries...")
+        df = df.sort_values(['match_id', 'inning', 'over', 'ball'])
+        df = tag_deliveries(df)
+
+        print("Processing data...")
+        batting = PhaseBattingProcessor()
+        bowling = PhaseBowlerProcessor()
+
+        # Both processors share a single pass over the tagged deliveries
+        for row in delivery_records(df):
+            batting.process_ball(row)
+            bowling.process_ball(row)
+
+        batting_stats = batting.calculate_final_stats()
+        bowling_stats = bowling.calculate_final_stats()
+
+        if batting_stats and bowling_stats:
+            batting_df = pd.DataFrame(batting_stats).sort_values('TotalRuns', ascending=False)
+            bowling_df = pd.DataFrame(bowling_stats).sort_values('Wickets', ascending=False)
+            batting_df.to_csv(batting_output_file, index=False)
+            bowling_df.to_csv(bowling_output_file, index=False)
+            print(f"\nSuccessfully processed data and saved to {batting_output_file} and {bowling_output_file}")
+
+            # Print sample of the data
+            print("\nTop death-over strikers (min 100 balls):")
+            print(batting_df[batting_df['DeathBalls'] >= 100]
+                  .sort_values('DeathStrikeRate', ascending=False)
+                  [['Player', 'DeathStrikeRate', 'DeathBoundaryPercentage', 'PressureStrikeRate']].head())
+            print("\nMost economical powerplay bowlers (min 300 balls):")
+            print(bowling_df[bowling_df['PowerplayBalls'] >= 300]
+                  .sort_values('PowerplayEconomy')
+                  [['Bowler', 'PowerplayEconomy', 'PowerplayDotPercentage', 'DeathEconomy']].head())
+            return True
+        else:
+            print("No valid statistics were generated")
+            return False
+
+    except Exception as e:
+        print(f"Error processing data: {str(e)}", file=sys.stderr)
+        return False
+
+
+if __name__ == "__main__":
+    # Run as `python -m cricket_squad.phase_metrics` from codes/; the relative
+    # imports fail when the file is run directly. Options match `cricket-squad phases`
+    from .cli import main
+    sys.exit(main(['phases'] + sys.argv[1:]))
@@ -0,0 +1,133 @@
+import csv
+from bisect import bisect_left
+
+XI_SIZE = 11
+BATTERS_IN_XI = 6
+# Sample floors below which averages and strike rates are mostly noise
+MIN_BALLS = 250
+MIN_DISMISSALS = 10
+
+
+def min_max(values):
+    """Scale a {player: value} mapping to 0-1 across the pool"""
+    if not values:
+        return {}
+    low, high = min(values.values()), max(values.values())
+    if high == low:
+        return {player: 0.0 for player in values}
+    return {player: (value - low) / (high - low) for player, value in values.items()}
+
+
+def balanced_xi(pool, bat_scores, bowl_scores):
+    """Take the best batters first, then fill the XI with the best bowling options"""
+    ordered = sorted(pool)
+    batters = sorted(ordered, key=lambda p: bat_scores.get(p, 0), reverse=True)[:BATTERS_IN_XI]
+    rest = [p for p in ordered if p not in batters]
+    bowlers = sorted(rest, key=lambda p: bowl_scores.get(p, 0), reverse=True)[:XI_SIZE - len(batters)]
+    return set(batters) | set(bowlers)
+
+
+def read_rows(path):
+    """Load a cached statistics CSV without pulling in pandas"""
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def batting_ratings(rows, min_balls=MIN_BALLS, min_dismissals=MIN_DISMISSALS):
+    """Consistency, Form and Overall ratings from the BattingScore notebook.
+
+    rows are the batting statistics written by script.py. AverageRun is runs
+    per dismissal, so players under min_dismissals are left unrated rather
+    than topping the scale on a couple of not-outs.
+    """
+    ave, fifty_plus, nb_sr, sr = {}, {}, {}, {}
+    for row in rows:
+        balls = int(row['BallsFaced'])
+        innings = int(row['Innings'])
+        dismissals = int(row['Dismissals'])
+        if balls < max(1, min_balls) or dismissals < max(1, min_dismissals) or not innings:
+            continue
+        player = row['Player']
+        runs = int(row['TotalRuns'])
+        fours, sixes = int(row['Fours']), int(row['Sixes'])
+        non_boundary_balls = balls - fours - sixes
+
+        ave[player] = float(row['AverageRun'])
+        sr[player] = float(row['StrikeRate'])
+        fifty_plus[player] = (int(row['Fifties']) + int(row['Hundreds'])) / innings
+        nb_sr[player] = ((runs - 4 * fours - 6 * sixes) / non_boundary_balls * 100
+                         if non_boundary_balls > 0 else 0)
+
+    ave, fifty_plus, nb_sr, sr = min_max(ave), min_max(fifty_plus), min_max(nb_sr), min_max(sr)
+    ratings = {}
+    for player in ave:
+        consistency = 0.4 * ave[player] + 0.3 * fifty_plus[player] + 0.1 * nb_sr[player]
+        form = 0.6 * ave[player] + 0.4 * sr[player]
+        ratings[player] = {
+            'BattingConsistency': round(consistency, 4),
+            'BattingForm': round(form, 4),
+            'BattingRating': round(0.7 * consistency + 0.3 * form, 4),
+        }
+    return ratings
+
+
+def bowler_consistency(inns_per_mat, wickets, ave, econ, sr, four_w, five_w, maidens):
+    """Weighted bowler consistency score from the final cell of BowlerConsistency.ipynb"""
+    return (0.163397 * inns_per_mat +
+            0.274010 * wickets -
+            0.203963 * ave -
+            0.157553 * econ -
+            0.115895 * sr / 100 +
+            0.047353 * (four_w + 1.25 * five_w) +
+            0.037830 * maidens)
+
+
+def bowling_ratings(rows, min_balls=MIN_BALLS):
+    """BowlerConsistency notebook score, scaled 0-1 across the bowlers rated.
+
+    rows are the bowling statistics written by script_bowlers.py. Bowlers
+    without a wicket have no average or strike rate and are left unrated,
+    as the notebook drops them. Files written before the 4W column existed
+    count no four-wicket hauls.
+    """
+    scores = {}
+    for row in rows:
+        wickets = int(row['Wickets'])
+        if float(row['Overs']) * 6 < max(1, min_balls) or not wickets:
+            continue
+        scores[row['Bowler']] = bowler_consistency(
+            int(row['Innings']) / int(row['Matches']), wickets,
+            float(row['Average']), float(row['Economy']), float(row['StrikeRate']),
+            int(row.get('4W') or 0), int(row['5W']), int(row['MaidenOvers']))
+
+    return {bowler: {'BowlingRating': round(score, 4)} for bowler, score in min_max(scores).items()}
+
+
+def percentiles(scores):
+    """Share of the other players each player scores above, 0-1"""
+    ordered = sorted(scores.values())
+    if len(ordered) < 2:
+        return {player: 1.0 for player in scores}
+    return {player: bisect_left(ordered, score) / (len(ordered) - 1)
+            for player, score in scores.items()}
+
+
+def combine_ratings(batting, bowling):
+    """One row per player with both ratings, best overall value first.
+
+    The two ratings come from different formulas over different players, so
+    OverallRating compares each player's percentile within their role.
+    """
+    bat_pct = percentiles({p: r['BattingRating'] for p, r in batting.items()})
+    bowl_pct = percentiles({p: r['BowlingRating'] for p, r in bowling.items()})
+    combined = []
+    for player in set(batting) | set(bowling):
+        row = {'Player': player, 'BattingConsistency': 0, 'BattingForm': 0,
+               'BattingRating': 0, 'BowlingRating': 0}
+        row.update(batting.get(player, {}))
+        row.update(bowling.get(player, {}))
+        row['BattingPercentile'] = round(bat_pct.get(player, 0), 4)
+        row['BowlingPercentile'] = round(bowl_pct.get(player, 0), 4)
+        row['OverallRating'] = max(row['BattingPercentile'], row['BowlingPercentile'])
+        combined.append(row)
+    return sorted(combined, key=lambda r: (-r['OverallRating'], r['Player']))
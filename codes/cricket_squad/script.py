@@ -1,6 +1,7 @@
 import pandas as pd
 from collections import defaultdict
 import numpy as np
+import sys
 
 class CricketDataProcessor:
     def __init__(self):
@@ -194,15 +195,17 @@ def process_cricket_data(input_file, output_file):
             print(f"Most duck outs: {stats_df.sort_values('DuckOuts', ascending=False).iloc[0]['Player']} "
                   f"({int(stats_df.sort_values('DuckOuts', ascending=False).iloc[0]['DuckOuts'])})")
             print(f"Most consistent opener: {stats_df[stats_df['OpeningInnings'] > 5].sort_values('AverageRun', ascending=False).iloc[0]['Player']}")
+            return True
         else:
             print("No valid statistics were generated")
+            return False
             
     except Exception as e:
-        print(f"Error processing data: {str(e)}")
+        print(f"Error processing data: {str(e)}", file=sys.stderr)
+        return False
 
 if __name__ == "__main__":
-    # Example usage
-    input_file = "/Users/dog/Documents/CricketSquadSelection/deliveries.csv"
-    output_file = "cricket_statistics_fixed.csv"
-    
-    process_cricket_data(input_file, output_file)
\ No newline at end of file
+    # Run as `python -m cricket_squad.script` from codes/; the relative
+    # imports fail when the file is run directly. Options match `cricket-squad batting`
+    from .cli import main
+    sys.exit(main(['batting'] + sys.argv[1:]))
@@ -1,6 +1,10 @@
 import pandas as pd
 from collections import defaultdict
 import numpy as np
+import sys
+
+# Dismissals credited to the bowler; run outs, retirements and obstructions are not
+BOWLER_DISMISSALS = {'bowled', 'caught', 'lbw', 'stumped', 'hit wicket', 'caught and bowled'}
 
 class BowlerDataProcessor:
     def __init__(self):
@@ -22,7 +26,7 @@ class BowlerDataProcessor:
             'extras': 0,
             'wickets_in_innings': defaultdict(int),
             'overs': defaultdict(lambda: {'runs': 0, 'balls': 0}),
-            'valid_dismissals': {'bowled', 'caught', 'lbw', 'stumped', 'hit wicket', 'caught and bowled'}
+            'valid_dismissals': BOWLER_DISMISSALS
         })
         
     def process_ball(self, row):
@@ -94,10 +98,12 @@ class BowlerDataProcessor:
                          if o['balls'] >= 6 and o['runs'] == 0)
             
             # Calculate wicket hauls
-            three_wickets = five_wickets = 0
+            three_wickets = four_wickets = five_wickets = 0
             for count in stats['wickets_in_innings'].values():
                 if count >= 5:
                     five_wickets += 1
+                if count == 4:
+                    four_wickets += 1
                 if count >= 3:
                     three_wickets += 1
                     
@@ -112,6 +118,7 @@ class BowlerDataProcessor:
                 'StrikeRate': round(strike_rate, 2),
                 'Average': round(average, 2),
                 '5W': five_wickets,
+                '4W': four_wickets,
                 '3W': three_wickets,
                 'MaidenOvers': maidens,
                 'DotBalls': stats['dot_balls'],
@@ -167,15 +174,17 @@ def process_bowler_data(input_file, output_file):
                   f"({int(stats_df.sort_values('5W', ascending=False).iloc[0]['5W'])})")
             print(f"Most 3-wicket hauls: {stats_df.sort_values('3W', ascending=False).iloc[0]['Bowler']} "
                   f"({int(stats_df.sort_values('3W', ascending=False).iloc[0]['3W'])})")
+            return True
         else:
             print("No valid statistics were generated")
+            return False
             
     except Exception as e:
-        print(f"Error processing data: {str(e)}")
+        print(f"Error processing data: {str(e)}", file=sys.stderr)
+        return False
 
 if __name__ == "__main__":
-    # Example usage
-    input_file = "/Users/dog/Documents/CricketSquadSelection/deliveries.csv"  # Replace with your input file path
-    output_file = "bowler_statistics.csv"  # Replace with your desired output file name
-    
-    process_bowler_data(input_file, output_file)
\ No newline at end of file
+    # Run as `python -m cricket_squad.script_bowlers` from codes/; the relative
+    # imports fail when the file is run directly. Options match `cricket-squad bowling`
+    from .cli import main
+    sys.exit(main(['bowling'] + sys.argv[1:]))